@@ -61,7 +61,7 @@ class AirtimeManager:
     def record_tx(self, airtime_ms: float):
         self.tx_history.append((time.time(), airtime_ms))
         self.total_airtime_ms += airtime_ms
-        logger.debug(f"TX recorded: {airtime_ms: .1f}ms (total: {self.total_airtime_ms: .0f}ms)")
+        logger.debug("TX recorded: %.1fms (total: %.0fms)", airtime_ms, self.total_airtime_ms)
 
     def get_stats(self) -> dict:
         now = time.time()
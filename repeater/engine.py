@@ -1,7 +1,9 @@
 import asyncio
+import heapq
 import logging
+import random
 import time
-from collections import OrderedDict
+from collections import deque
 from typing import Optional, Tuple
 
 from pymc_core.node.handlers.base import BaseHandler
@@ -19,6 +21,18 @@ from repeater.airtime import AirtimeManager
 
 logger = logging.getLogger("RepeaterHandler")
 
+# Counting Bloom filter size for the duplicate-cache fast path (counters, not
+# bits); power of two so indices reduce with a mask instead of a modulo
+_BLOOM_SIZE = 8192
+_BLOOM_MASK = _BLOOM_SIZE - 1
+
+# Local binding skips the module attribute lookup on the per-packet delay path
+_uniform = random.uniform
+
+# SNR thresholds per SF (from MeshCore RadioLibWrappers.cpp), indexed by
+# spreading factor; entries below SF7 are never used
+_SNR_THRESHOLD_BY_SF = (-10.0,) * 7 + (-7.5, -10.0, -12.5, -15.0, -17.5, -20.0)
+
 
 class RepeaterHandler(BaseHandler):
 
@@ -34,7 +48,12 @@ class RepeaterHandler(BaseHandler):
         self.local_hash = local_hash
         self.send_advert_func = send_advert_func
         self.airtime_mgr = AirtimeManager(config)
-        self.seen_packets = OrderedDict()
+        # Plain dict: insertion order gives us LRU order (re-insert to touch,
+        # pop the first key to evict) without OrderedDict's per-op overhead
+        self.seen_packets = {}
+        # Counting Bloom filter in front of seen_packets: lets the common
+        # "never seen before" case skip the dict lookup entirely
+        self._seen_bloom = bytearray(_BLOOM_SIZE)
         self.cache_ttl = config.get("repeater", {}).get("cache_ttl", 60)
         self.max_cache_size = 1000
         self.tx_delay_factor = config.get("delays", {}).get("tx_delay_factor", 1.0)
@@ -44,7 +63,15 @@ class RepeaterHandler(BaseHandler):
         self.send_advert_interval_hours = config.get("repeater", {}).get(
             "send_advert_interval_hours", 10
         )
-        self.last_advert_time = time.time()
+        self._advert_interval_seconds = self.send_advert_interval_hours * 3600
+
+        # Mode is cached so __call__ doesn't do nested config lookups per
+        # packet; runtime changes go through set_mode()
+        self._mode = config.get("repeater", {}).get("mode", "forward")
+        self._monitor_mode = self._mode == "monitor"
+        # Monotonic so NTP steps or DST can't double-fire or stall the
+        # hour-scale advert interval
+        self.last_advert_time = time.monotonic()
 
         radio = dispatcher.radio if dispatcher else None
         if radio:
@@ -63,48 +90,156 @@ class RepeaterHandler(BaseHandler):
         else:
             raise RuntimeError("Radio object not available - cannot initialize repeater")
 
+        # Spreading factor is fixed for the session; cache it for per-packet scoring
+        self._sf = self.radio_config["spreading_factor"]
+
+        # Hex-encoding every payload into the record ring costs CPU and holds
+        # the strings in memory; deployments that never open the packet detail
+        # view can turn it off
+        self._store_payload_hex = config.get("repeater", {}).get("store_payload_hex", True)
+
         # Statistics tracking for dashboard
         self.rx_count = 0
         self.forwarded_count = 0
         self.dropped_count = 0
-        self.recent_packets = []
         self.max_recent_packets = 50
-        self.start_time = time.time()  # For uptime calculation
+        self.recent_packets = deque(maxlen=self.max_recent_packets)
+        # Index into recent_packets by truncated packet hash for O(1)
+        # duplicate-attachment lookups
+        self._recent_by_hash = {}
+
+        # Rolling 1-hour windows of raw timestamps, pruned incrementally on
+        # each RX so get_stats reports hourly rates without scanning records
+        self._rx_times = deque()
+        self._fwd_times = deque()
+
+        # Set by the forwarding helpers at the exact point of rejection so
+        # __call__ doesn't have to re-derive why a packet was dropped
+        self._last_drop_reason: Optional[str] = None
+        self.start_time = time.monotonic()  # For uptime calculation (immune to clock steps)
 
         # Neighbor tracking (repeaters discovered via adverts)
         self.neighbors = {}
 
+        # Noise floor varies slowly but the read goes over the radio bus;
+        # memoize briefly and count hits/misses so the TTL can be tuned
+        self._noise_floor_ttl = 5.0
+        self._noise_floor_cached = None
+        self._noise_floor_cached_at = float("-inf")  # Force the first read
+        self._noise_floor_hits = 0
+        self._noise_floor_misses = 0
+
+        # Instrumentation for the stats endpoint itself: poll count, config
+        # block rebuilds and cumulative build time
+        self._stats_counters = {"calls": 0, "config_rebuilds": 0, "build_ns_total": 0}
+
+        # Scheduled retransmissions: one worker task drains a deadline heap
+        # instead of spawning a short-lived task per forwarded packet
+        self._tx_heap = []  # [(send_at_monotonic, seq, fwd_pkt, airtime_ms), ...]
+        self._tx_heap_event = asyncio.Event()
+        self._tx_seq = 0
+        self._tx_worker_task = None
+        self._advert_task = None
+        # Set on shutdown; lets long advert sleeps end cooperatively instead
+        # of relying on cancellation propagating through them
+        self._stop_event = asyncio.Event()
+
+        # Route-type dispatch for process_packet; only the forward step
+        # differs between route types, the delay calculation is shared
+        self._route_handlers = {
+            ROUTE_TYPE_FLOOD: self.flood_forward,
+            ROUTE_TYPE_DIRECT: self.direct_forward,
+        }
+
+        # Static pieces of the get_stats config block, built once; dynamic
+        # fields (mode, duty-cycle enforcement) are merged in per call
+        repeater_config = config.get("repeater", {})
+        delays_config = config.get("delays", {})
+        max_airtime_ms = config.get("duty_cycle", {}).get("max_airtime_per_minute", 3600)
+        self._max_duty_cycle_percent = (max_airtime_ms / 60000) * 100  # 60000ms = 1 minute
+        self._node_name = repeater_config.get("node_name", "Unknown")
+        self._repeater_stats_static = {
+            "use_score_for_tx": self.use_score_for_tx,
+            "score_threshold": self.score_threshold,
+            "send_advert_interval_hours": self.send_advert_interval_hours,
+            "latitude": repeater_config.get("latitude", 0.0),
+            "longitude": repeater_config.get("longitude", 0.0),
+        }
+        self._radio_stats_static = {
+            "frequency": self.radio_config.get("frequency", 0),
+            "tx_power": self.radio_config.get("tx_power", 0),
+            "bandwidth": self.radio_config.get("bandwidth", 0),
+            "spreading_factor": self.radio_config.get("spreading_factor", 0),
+            "coding_rate": self.radio_config.get("coding_rate", 0),
+            "preamble_length": self.radio_config.get("preamble_length", 0),
+        }
+        self._delays_stats_static = {
+            "tx_delay_factor": delays_config.get("tx_delay_factor", 1.0),
+            "direct_tx_delay_factor": delays_config.get("direct_tx_delay_factor", 0.5),
+        }
+        self._stats_config_cache = None  # Built lazily by _get_stats_config
+
     async def __call__(self, packet: Packet, metadata: Optional[dict] = None) -> None:
 
         if metadata is None:
             metadata = {}
 
+        # One wall-clock read per packet; everything below reuses it
+        now = time.time()
+
         # Track incoming packet
         self.rx_count += 1
-
-        # Check if it's time to send a periodic advertisement
-        await self._check_and_send_periodic_advert()
+        self._rx_times.append(now)
+        while self._rx_times and now - self._rx_times[0] > 3600:
+            self._rx_times.popleft()
+        while self._fwd_times and now - self._fwd_times[0] > 3600:
+            self._fwd_times.popleft()
 
         # Check if we're in monitor mode (receive only, no forwarding)
-        mode = self.config.get("repeater", {}).get("mode", "forward")
-        monitor_mode = mode == "monitor"
+        monitor_mode = self._monitor_mode
 
-        logger.debug(
-            f"RX packet: header=0x{packet.header:02x}, payload_len={len(packet.payload or b'')}, "
-            f"path_len={len(packet.path) if packet.path else 0}, "
-            f"rssi={metadata.get('rssi', 'N/A')}, snr={metadata.get('snr', 'N/A')}, mode={mode}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "RX packet: header=0x%02x, payload_len=%d, path_len=%d, "
+                "rssi=%s, snr=%s, mode=%s",
+                packet.header,
+                len(packet.payload or b""),
+                len(packet.path) if packet.path else 0,
+                metadata.get("rssi", "N/A"),
+                metadata.get("snr", "N/A"),
+                self._mode,
+            )
 
         snr = metadata.get("snr", 0.0)
         rssi = metadata.get("rssi", 0)
+
+        # Score the packet once; both the record and the tx-delay logic use it
+        score = self.calculate_packet_score(snr, len(packet.payload or b""), self._sf)
+
         transmitted = False
         tx_delay_ms = 0.0
         drop_reason = None
 
         original_path = list(packet.path) if packet.path else []
 
+        # Hash exactly once per RX; Packet is slotted, so the digest is
+        # threaded through as a parameter rather than cached on the instance
+        digest = packet.calculate_packet_hash()
+        pkt_hash = digest.hex()
+
+        # Derive the route bits once; the forwarding helpers reuse this instead
+        # of re-masking the header at every level
+        route_bits = (
+            packet.header & PH_ROUTE_MASK
+            if hasattr(packet, "header") and packet.header is not None
+            else None
+        )
+
         # Process for forwarding (skip if in monitor mode)
-        result = None if monitor_mode else self.process_packet(packet, snr)
+        self._last_drop_reason = None
+        result = (
+            None if monitor_mode else self.process_packet(packet, snr, route_bits, score, digest)
+        )
         forwarded_path = None
         if result:
             fwd_pkt, delay = result
@@ -130,6 +265,7 @@ class RepeaterHandler(BaseHandler):
                 drop_reason = "Duty cycle limit"
             else:
                 self.forwarded_count += 1
+                self._fwd_times.append(now)
                 transmitted = True
                 # Schedule retransmit with delay
                 await self.schedule_retransmit(fwd_pkt, delay, airtime_ms)
@@ -139,8 +275,12 @@ class RepeaterHandler(BaseHandler):
             if monitor_mode:
                 drop_reason = "Monitor mode"
             else:
-                drop_reason = self._get_drop_reason(packet)
-            logger.debug(f"Packet not forwarded: {drop_reason}")
+                # The forwarding helpers record the reason as they reject;
+                # only re-derive it on the truly unexplained path
+                drop_reason = self._last_drop_reason
+                if drop_reason is None:
+                    drop_reason = self._get_drop_reason(packet, route_bits, digest)
+            logger.debug("Packet not forwarded: %s", drop_reason)
 
         # Extract packet type and route from header
         if not hasattr(packet, "header") or packet.header is None:
@@ -152,12 +292,11 @@ class RepeaterHandler(BaseHandler):
             payload_type = header_info["payload_type"]
             route_type = header_info["route_type"]
             logger.debug(
-                f"Packet header=0x{packet.header:02x}, type={payload_type}, route={route_type}"
+                "Packet header=0x%02x, type=%s, route=%s", packet.header, payload_type, route_type
             )
 
-        # Check if this is a duplicate
-        pkt_hash = packet.calculate_packet_hash().hex()
-        is_dupe = pkt_hash in self.seen_packets and not transmitted
+        # Check if this is a duplicate (seen_packets is keyed on the raw digest)
+        is_dupe = digest in self.seen_packets and not transmitted
 
         # Set drop reason for duplicates
         if is_dupe and drop_reason is None:
@@ -165,16 +304,22 @@ class RepeaterHandler(BaseHandler):
 
         # Process adverts for neighbor tracking
         if payload_type == PAYLOAD_TYPE_ADVERT:
-            self._process_advert(packet, rssi, snr)
+            self._process_advert(packet, rssi, snr, now)
 
-        path_hash = None
-        display_path = (
-            original_path if original_path else (list(packet.path) if packet.path else [])
+        # Hex-encode each path exactly once; path_hash and the record fields
+        # below all reuse these lists
+        original_hex = [f"{b:02X}" for b in original_path] if original_path else None
+        forwarded_hex = (
+            [f"{b:02X}" for b in forwarded_path] if forwarded_path is not None else None
         )
-        if display_path and len(display_path) > 0:
-            # Format path as array of uppercase hex bytes
-            path_bytes = [f"{b:02X}" for b in display_path[:8]]  # First 8 bytes max
-            if len(display_path) > 8:
+
+        path_hash = None
+        display_hex = original_hex
+        if display_hex is None and packet.path:
+            display_hex = [f"{b:02X}" for b in packet.path]
+        if display_hex:
+            path_bytes = display_hex[:8]  # First 8 bytes max (fresh slice, safe to extend)
+            if len(display_hex) > 8:
                 path_bytes.append("...")
             path_hash = "[" + ", ".join(path_bytes) + "]"
 
@@ -194,18 +339,20 @@ class RepeaterHandler(BaseHandler):
 
         # Record packet for charts
         packet_record = {
-            "timestamp": time.time(),
+            "timestamp": now,
             "header": f"0x{packet.header:02X}" if hasattr(packet, "header") and packet.header is not None else None,
-            "payload": packet.payload.hex() if hasattr(packet, "payload") and packet.payload else None,
+            "payload": (
+                packet.payload.hex()
+                if self._store_payload_hex and hasattr(packet, "payload") and packet.payload
+                else None
+            ),
             "payload_length": len(packet.payload) if hasattr(packet, "payload") and packet.payload else 0,
             "type": payload_type,
             "route": route_type,
             "length": len(packet.payload or b""),
             "rssi": rssi,
             "snr": snr,
-            "score": self.calculate_packet_score(
-                snr, len(packet.payload or b""), self.radio_config["spreading_factor"]
-            ),
+            "score": score,
             "tx_delay_ms": tx_delay_ms,
             "transmitted": transmitted,
             "is_duplicate": is_dupe,
@@ -214,59 +361,77 @@ class RepeaterHandler(BaseHandler):
             "path_hash": path_hash,
             "src_hash": src_hash,
             "dst_hash": dst_hash,
-            "original_path": ([f"{b:02X}" for b in original_path] if original_path else None),
-            "forwarded_path": (
-                [f"{b:02X}" for b in forwarded_path] if forwarded_path is not None else None
-            ),
+            "original_path": original_hex,
+            "forwarded_path": forwarded_hex,
 
         }
 
         # If this is a duplicate, try to attach it to the original packet
-        if is_dupe and len(self.recent_packets) > 0:
-            # Find the original packet with same hash
-            for idx in range(len(self.recent_packets) - 1, -1, -1):
-                prev_pkt = self.recent_packets[idx]
-                if prev_pkt.get("packet_hash") == packet_record["packet_hash"]:
-                    # Add duplicate to original packet's duplicate list
-                    if "duplicates" not in prev_pkt:
-                        prev_pkt["duplicates"] = []
-                    prev_pkt["duplicates"].append(packet_record)
-                    # Don't add duplicate to main list, just track in original
-                    break
+        if is_dupe:
+            prev_pkt = self._recent_by_hash.get(packet_record["packet_hash"])
+            if prev_pkt is not None:
+                # Add duplicate to original packet's duplicate list
+                # (don't add duplicate to main list, just track in original)
+                prev_pkt.setdefault("duplicates", []).append(packet_record)
             else:
-                # Original not found, add as regular packet
-                self.recent_packets.append(packet_record)
+                # Original not found (already evicted), add as regular packet
+                self._append_recent(packet_record)
         else:
             # Not a duplicate or first occurrence
-            self.recent_packets.append(packet_record)
+            self._append_recent(packet_record)
 
-        if len(self.recent_packets) > self.max_recent_packets:
-            self.recent_packets.pop(0)
+    def _append_recent(self, packet_record: dict) -> None:
+
+        # The deque auto-evicts at maxlen, so unhook the victim from the
+        # hash index before the append pushes it out
+        if len(self.recent_packets) == self.max_recent_packets:
+            evicted = self.recent_packets[0]
+            # Only drop the index entry if it still points at the evicted record
+            if self._recent_by_hash.get(evicted["packet_hash"]) is evicted:
+                del self._recent_by_hash[evicted["packet_hash"]]
 
-    def log_trace_record(self, packet_record: dict) -> None:
         self.recent_packets.append(packet_record)
-        
+        self._recent_by_hash[packet_record["packet_hash"]] = packet_record
+
+    def log_trace_record(self, packet_record: dict) -> None:
+        self._append_recent(packet_record)
+
         self.rx_count += 1
         if packet_record.get("transmitted", False):
             self.forwarded_count += 1
         else:
             self.dropped_count += 1
-        
-        if len(self.recent_packets) > self.max_recent_packets:
-            self.recent_packets.pop(0)
-
-    def cleanup_cache(self):
 
-        now = time.time()
-        expired = [k for k, ts in self.seen_packets.items() if now - ts > self.cache_ttl]
-        for k in expired:
-            del self.seen_packets[k]
-
-
-
-    def _get_drop_reason(self, packet: Packet) -> str:
+    @staticmethod
+    def _bloom_indices(digest: bytes) -> Tuple[int, int, int]:
+        # Three independent indices taken straight out of the packet hash;
+        # plain byte arithmetic, no slice allocations
+        return (
+            ((digest[0] << 8) | digest[1]) & _BLOOM_MASK,
+            ((digest[2] << 8) | digest[3]) & _BLOOM_MASK,
+            ((digest[4] << 8) | digest[5]) & _BLOOM_MASK,
+        )
 
-        if self.is_duplicate(packet):
+    def _bloom_add(self, digest: bytes):
+        for idx in self._bloom_indices(digest):
+            if self._seen_bloom[idx] < 255:
+                self._seen_bloom[idx] += 1
+
+    def _bloom_discard(self, digest: bytes):
+        for idx in self._bloom_indices(digest):
+            # Saturated counters stay saturated; a stale positive only costs
+            # a dict lookup, never a wrong forwarding decision
+            if 0 < self._seen_bloom[idx] < 255:
+                self._seen_bloom[idx] -= 1
+
+    def _get_drop_reason(
+        self,
+        packet: Packet,
+        route_type: Optional[int] = None,
+        digest: Optional[bytes] = None,
+    ) -> str:
+
+        if self.is_duplicate(packet, digest):
             return "Duplicate"
 
         if not packet or not packet.payload:
@@ -275,7 +440,8 @@ class RepeaterHandler(BaseHandler):
         if len(packet.path or []) >= MAX_PATH_SIZE:
             return "Path too long"
 
-        route_type = packet.header & PH_ROUTE_MASK
+        if route_type is None:
+            route_type = packet.header & PH_ROUTE_MASK
 
         if route_type == ROUTE_TYPE_DIRECT:
             if not packet.path or len(packet.path) == 0:
@@ -287,7 +453,9 @@ class RepeaterHandler(BaseHandler):
         # Default reason
         return "Unknown"
 
-    def _process_advert(self, packet: Packet, rssi: int, snr: float):
+    def _process_advert(
+        self, packet: Packet, rssi: int, snr: float, now: Optional[float] = None
+    ):
 
         try:
             from pymc_core.protocol.constants import ADVERT_FLAG_IS_REPEATER
@@ -333,7 +501,7 @@ class RepeaterHandler(BaseHandler):
             latitude = appdata_decoded.get("latitude")
             longitude = appdata_decoded.get("longitude")
 
-            current_time = time.time()
+            current_time = now if now is not None else time.time()
 
             # Update or create neighbor entry
             if pubkey not in self.neighbors:
@@ -362,23 +530,55 @@ class RepeaterHandler(BaseHandler):
                 neighbor["advert_count"] = neighbor.get("advert_count", 0) + 1
 
         except Exception as e:
-            logger.debug(f"Error processing advert for neighbor tracking: {e}")
+            logger.debug("Error processing advert for neighbor tracking: %s", e)
 
-    def is_duplicate(self, packet: Packet) -> bool:
+    def is_duplicate(self, packet: Packet, digest: Optional[bytes] = None) -> bool:
 
-        pkt_hash = packet.calculate_packet_hash().hex()
-        if pkt_hash in self.seen_packets:
-            logger.debug(f"Duplicate suppressed: {pkt_hash[:16]}")
-            return True
-        return False
+        if digest is None:
+            digest = packet.calculate_packet_hash()
 
-    def mark_seen(self, packet: Packet):
+        # Bloom filter fast path: most packets are new, and any zero counter
+        # proves this one was never marked seen
+        bloom = self._seen_bloom
+        for idx in self._bloom_indices(digest):
+            if not bloom[idx]:
+                return False
 
-        pkt_hash = packet.calculate_packet_hash().hex()
-        self.seen_packets[pkt_hash] = time.time()
+        if digest in self.seen_packets:
+            # Refresh LRU position so busy hashes stay resident
+            self.seen_packets[digest] = self.seen_packets.pop(digest)
+            logger.debug("Duplicate suppressed: %s", digest.hex()[:16])
+            return True
+        return False
 
+    def mark_seen(
+        self, packet: Packet, now: Optional[float] = None, digest: Optional[bytes] = None
+    ):
+
+        if digest is None:
+            digest = packet.calculate_packet_hash()
+        if now is None:
+            now = time.time()
+        if digest in self.seen_packets:
+            self.seen_packets.pop(digest)
+            self.seen_packets[digest] = now
+        else:
+            self.seen_packets[digest] = now
+            self._bloom_add(digest)
+
+        # Amortized eviction: expire stale entries from the cold end on insert,
+        # then enforce the size cap (no periodic full scan needed)
+        while self.seen_packets:
+            oldest_key = next(iter(self.seen_packets))
+            if now - self.seen_packets[oldest_key] > self.cache_ttl:
+                del self.seen_packets[oldest_key]
+                self._bloom_discard(oldest_key)
+            else:
+                break
         if len(self.seen_packets) > self.max_cache_size:
-            self.seen_packets.popitem(last=False)
+            evicted_key = next(iter(self.seen_packets))
+            del self.seen_packets[evicted_key]
+            self._bloom_discard(evicted_key)
 
     def validate_packet(self, packet: Packet) -> Tuple[bool, str]:
 
@@ -390,16 +590,18 @@ class RepeaterHandler(BaseHandler):
 
         return True, ""
 
-    def flood_forward(self, packet: Packet) -> Optional[Packet]:
+    def flood_forward(self, packet: Packet, digest: Optional[bytes] = None) -> Optional[Packet]:
 
         # Validate
         valid, reason = self.validate_packet(packet)
         if not valid:
-            logger.debug(f"Flood validation failed: {reason}")
+            logger.debug("Flood validation failed: %s", reason)
+            self._last_drop_reason = reason
             return None
 
         # Suppress duplicates
-        if self.is_duplicate(packet):
+        if self.is_duplicate(packet, digest):
+            self._last_drop_reason = "Duplicate"
             return None
 
         if packet.path is None:
@@ -410,45 +612,52 @@ class RepeaterHandler(BaseHandler):
         packet.path.append(self.local_hash)
         packet.path_len = len(packet.path)
 
-        self.mark_seen(packet)
-        logger.debug(f"Flood: forwarding with path len {packet.path_len}")
+        self.mark_seen(packet, digest=digest)
+        logger.debug("Flood: forwarding with path len %d", packet.path_len)
 
         return packet
 
-    def direct_forward(self, packet: Packet) -> Optional[Packet]:
+    def direct_forward(self, packet: Packet, digest: Optional[bytes] = None) -> Optional[Packet]:
 
         # Check if we're the next hop
         if not packet.path or len(packet.path) == 0:
             logger.debug("Direct: no path")
+            self._last_drop_reason = "Direct: no path"
             return None
 
         next_hop = packet.path[0]
         if next_hop != self.local_hash:
             logger.debug(
-                f"Direct: not our hop (next={next_hop:02X}, local={self.local_hash:02X})"
+                "Direct: not our hop (next=%02X, local=%02X)", next_hop, self.local_hash
             )
+            self._last_drop_reason = "Direct: not for us"
             return None
 
-        original_path = list(packet.path)
-        packet.path = bytearray(packet.path[1:])
+        debug = logger.isEnabledFor(logging.DEBUG)
+        old_path = [f"{b:02X}" for b in packet.path] if debug else None
+
+        # Pop our hop in place where possible; slicing would allocate and
+        # copy a fresh bytearray per direct-forwarded packet
+        if not isinstance(packet.path, bytearray):
+            packet.path = bytearray(packet.path)
+        del packet.path[0]
         packet.path_len = len(packet.path)
 
-        old_path = [f"{b:02X}" for b in original_path]
-        new_path = [f"{b:02X}" for b in packet.path]
-        logger.debug(f"Direct: forwarding, path {old_path} -> {new_path}")
+        if debug:
+            new_path = [f"{b:02X}" for b in packet.path]
+            logger.debug("Direct: forwarding, path %s -> %s", old_path, new_path)
 
         return packet
 
     @staticmethod
     def calculate_packet_score(snr: float, packet_len: int, spreading_factor: int = 8) -> float:
 
-        # SNR thresholds per SF (from MeshCore RadioLibWrappers.cpp)
-        snr_thresholds = {7: -7.5, 8: -10.0, 9: -12.5, 10: -15.0, 11: -17.5, 12: -20.0}
-
         if spreading_factor < 7:
             return 0.0
 
-        threshold = snr_thresholds.get(spreading_factor, -10.0)
+        threshold = (
+            _SNR_THRESHOLD_BY_SF[spreading_factor] if spreading_factor <= 12 else -10.0
+        )
 
         # Below threshold = no chance of success
         if snr < threshold:
@@ -465,14 +674,19 @@ class RepeaterHandler(BaseHandler):
 
         return max(0.0, min(1.0, score))
 
-    def _calculate_tx_delay(self, packet: Packet, snr: float = 0.0) -> float:
-
-        import random
+    def _calculate_tx_delay(
+        self,
+        packet: Packet,
+        snr: float = 0.0,
+        route_type: Optional[int] = None,
+        score: Optional[float] = None,
+    ) -> float:
 
         packet_len = len(packet.payload) if packet.payload else 0
         airtime_ms = PacketTimingUtils.estimate_airtime_ms(packet_len, self.radio_config)
 
-        route_type = packet.header & PH_ROUTE_MASK
+        if route_type is None:
+            route_type = packet.header & PH_ROUTE_MASK
 
         # Base delay calculations
         # this part took me along time to get right well i hope i got it right ;-)
@@ -481,7 +695,7 @@ class RepeaterHandler(BaseHandler):
             # Flood packets: random(0-5) * (airtime * 52/50 / 2) * tx_delay_factor
             # This creates collision avoidance with tunable delay
             base_delay_ms = (airtime_ms * 52 / 50) / 2.0  # From C++ implementation
-            random_mult = random.uniform(0, 5)  # Random multiplier for collision avoidance
+            random_mult = _uniform(0, 5)  # Random multiplier for collision avoidance
             delay_ms = base_delay_ms * random_mult * self.tx_delay_factor
             delay_s = delay_ms / 1000.0
         else:  # DIRECT
@@ -492,53 +706,86 @@ class RepeaterHandler(BaseHandler):
         # Apply score-based delay adjustment ONLY if delay >= 50ms threshold
         # (matching C++ reactive behavior in Dispatcher::calcRxDelay)
         if delay_s >= 0.05 and self.use_score_for_tx:
-            score = self.calculate_packet_score(snr, packet_len)
+            if score is None:
+                score = self.calculate_packet_score(snr, packet_len, self._sf)
             # Higher score = shorter delay: max(0.2, 1.0 - score)
             # score 1.0 → multiplier 0.2 (20% of original)
             # score 0.0 → multiplier 1.0 (100% of original)
             score_multiplier = max(0.2, 1.0 - score)
             delay_s = delay_s * score_multiplier
             logger.debug(
-                f"Congestion detected (delay >= 50ms), score={score:.2f}, "
-                f"delay multiplier={score_multiplier:.2f}"
+                "Congestion detected (delay >= 50ms), score=%.2f, delay multiplier=%.2f",
+                score,
+                score_multiplier,
             )
 
         # Cap at 5 seconds maximum
         delay_s = min(delay_s, 5.0)
 
         logger.debug(
-            f"Route={'FLOOD' if route_type == ROUTE_TYPE_FLOOD else 'DIRECT'}, "
-            f"len={packet_len}B, airtime={airtime_ms:.1f}ms, delay={delay_s:.3f}s"
+            "Route=%s, len=%dB, airtime=%.1fms, delay=%.3fs",
+            "FLOOD" if route_type == ROUTE_TYPE_FLOOD else "DIRECT",
+            packet_len,
+            airtime_ms,
+            delay_s,
         )
 
         return delay_s
 
-    def process_packet(self, packet: Packet, snr: float = 0.0) -> Optional[Tuple[Packet, float]]:
-
-        route_type = packet.header & PH_ROUTE_MASK
-
-        if route_type == ROUTE_TYPE_FLOOD:
-            fwd_pkt = self.flood_forward(packet)
-            if fwd_pkt is None:
-                return None
-            delay = self._calculate_tx_delay(fwd_pkt, snr)
-            return fwd_pkt, delay
-
-        elif route_type == ROUTE_TYPE_DIRECT:
-            fwd_pkt = self.direct_forward(packet)
-            if fwd_pkt is None:
-                return None
-            delay = self._calculate_tx_delay(fwd_pkt, snr)
-            return fwd_pkt, delay
+    def process_packet(
+        self,
+        packet: Packet,
+        snr: float = 0.0,
+        route_type: Optional[int] = None,
+        score: Optional[float] = None,
+        digest: Optional[bytes] = None,
+    ) -> Optional[Tuple[Packet, float]]:
+
+        if route_type is None:
+            route_type = packet.header & PH_ROUTE_MASK
+
+        forward = self._route_handlers.get(route_type)
+        if forward is None:
+            logger.debug("Unknown route type: %s", route_type)
+            self._last_drop_reason = "Unknown route type"
+            return None
 
-        else:
-            logger.debug(f"Unknown route type: {route_type}")
+        fwd_pkt = forward(packet, digest)
+        if fwd_pkt is None:
             return None
+        delay = self._calculate_tx_delay(fwd_pkt, snr, route_type, score)
+        return fwd_pkt, delay
 
     async def schedule_retransmit(self, fwd_pkt: Packet, delay: float, airtime_ms: float = 0.0):
 
-        async def delayed_send():
-            await asyncio.sleep(delay)
+        self._tx_seq += 1
+        heapq.heappush(
+            self._tx_heap, (time.monotonic() + delay, self._tx_seq, fwd_pkt, airtime_ms)
+        )
+        self._tx_heap_event.set()
+        if self._tx_worker_task is None or self._tx_worker_task.done():
+            self._tx_worker_task = asyncio.create_task(self._tx_worker())
+
+    async def _tx_worker(self):
+
+        while True:
+            if not self._tx_heap:
+                self._tx_heap_event.clear()
+                await self._tx_heap_event.wait()
+                continue
+
+            send_at, _, fwd_pkt, airtime_ms = self._tx_heap[0]
+            delay = send_at - time.monotonic()
+            if delay > 0:
+                self._tx_heap_event.clear()
+                try:
+                    # A packet with an earlier deadline may be pushed while we wait
+                    await asyncio.wait_for(self._tx_heap_event.wait(), timeout=delay)
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+
+            heapq.heappop(self._tx_heap)
             try:
                 await self.dispatcher.send_packet(fwd_pkt, wait_for_ack=False)
                 # Record airtime after successful TX
@@ -551,15 +798,67 @@ class RepeaterHandler(BaseHandler):
             except Exception as e:
                 logger.error(f"Retransmit failed: {e}")
 
-        asyncio.create_task(delayed_send())
-
-    async def _check_and_send_periodic_advert(self):
-
+    def start_background_tasks(self):
+        """Start background tasks; call once the event loop is running."""
+        # Decide here, once: a disabled advert timer never gets a task at all
         if self.send_advert_interval_hours <= 0 or not self.send_advert_func:
+            logger.info("Periodic adverts disabled; advert task not started")
             return
+        if self._advert_task is None or self._advert_task.done():
+            self._advert_task = asyncio.create_task(self._advert_loop())
+
+    async def _advert_loop(self):
 
-        current_time = time.time()
-        interval_seconds = self.send_advert_interval_hours * 3600  # Convert hours to seconds
+        interval_seconds = self._advert_interval_seconds
+
+        # Single long-lived task: errors are retried in place so the task
+        # handle stays stable instead of respawning a task per failure
+        while not self._stop_event.is_set():
+            try:
+                delay = (self.last_advert_time + interval_seconds) - time.monotonic()
+                if delay > 0:
+                    # Sleep to the deadline, then re-derive it: a manual advert
+                    # from the dashboard may have pushed it further out
+                    if await self._sleep_or_stop(delay):
+                        return
+                    continue
+
+                await self._check_and_send_periodic_advert()
+
+                if (self.last_advert_time + interval_seconds) - time.monotonic() <= 0:
+                    # Send failed (last_advert_time didn't advance); back off
+                    # instead of spinning on the elapsed deadline
+                    if await self._sleep_or_stop(60):
+                        return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Advert task error: {e}", exc_info=True)
+                if await self._sleep_or_stop(30):
+                    return
+
+    async def _sleep_or_stop(self, delay: float) -> bool:
+        """Sleep up to delay seconds; returns True if shutdown was requested."""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def stop_background_tasks(self):
+        """Signal background tasks to exit and wait for them to finish."""
+        self._stop_event.set()
+        if self._tx_worker_task is not None:
+            self._tx_worker_task.cancel()
+        tasks = [t for t in (self._advert_task, self._tx_worker_task) if t is not None]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _check_and_send_periodic_advert(self, now: Optional[float] = None):
+
+        # last_advert_time is monotonic, so any supplied 'now' must be too
+        current_time = now if now is not None else time.monotonic()
+        interval_seconds = self._advert_interval_seconds
         time_since_last_advert = current_time - self.last_advert_time
 
         # Check if interval has elapsed
@@ -568,44 +867,85 @@ class RepeaterHandler(BaseHandler):
                 f"Periodic advert interval elapsed ({time_since_last_advert:.0f}s >= "
                 f"{interval_seconds:.0f}s). Sending advert..."
             )
+            # Bound the send so a stuck TX (radio contention, driver hang)
+            # can't block the advert task indefinitely
+            send_timeout = min(60.0, interval_seconds * 0.9)
             try:
-                # Call the send_advert function
-                success = await self.send_advert_func()
+                success = await asyncio.wait_for(self.send_advert_func(), timeout=send_timeout)
                 if success:
                     self.last_advert_time = current_time
                     logger.info("Periodic advert sent successfully")
                 else:
                     logger.warning("Failed to send periodic advert")
+            except asyncio.TimeoutError:
+                logger.warning("Periodic advert send timed out after %.0fs", send_timeout)
             except Exception as e:
                 logger.error(f"Error sending periodic advert: {e}", exc_info=True)
 
+    def set_mode(self, mode: str):
+        """Switch between 'forward' and 'monitor' mode at runtime."""
+        self._mode = mode
+        self._monitor_mode = mode == "monitor"
+        logger.info("Repeater mode set to: %s", mode)
+
     def get_noise_floor(self) -> Optional[float]:
+        now = time.monotonic()
+        if now - self._noise_floor_cached_at < self._noise_floor_ttl:
+            self._noise_floor_hits += 1
+            return self._noise_floor_cached
+
+        self._noise_floor_misses += 1
         try:
             radio = self.dispatcher.radio if self.dispatcher else None
+            value = None
             if radio and hasattr(radio, 'get_noise_floor'):
-                return radio.get_noise_floor()
-            return None
+                value = radio.get_noise_floor()
         except Exception as e:
-            logger.debug(f"Failed to get noise floor: {e}")
-            return None
+            logger.debug("Failed to get noise floor: %s", e)
+            value = None
+
+        self._noise_floor_cached = value
+        self._noise_floor_cached_at = now
+        return value
+
+    def _get_stats_config(self) -> dict:
+
+        # The config block only changes when the mode or the duty-cycle
+        # enforcement flag is flipped through the API; rebuild on change and
+        # hand back the cached dict otherwise
+        enforcement = self.config.get("duty_cycle", {}).get("enforcement_enabled", True)
+        cached = self._stats_config_cache
+        if (
+            cached is None
+            or cached["repeater"]["mode"] != self._mode
+            or cached["duty_cycle"]["enforcement_enabled"] != enforcement
+        ):
+            cached = {
+                "node_name": self._node_name,
+                "repeater": dict(self._repeater_stats_static, mode=self._mode),
+                "radio": self._radio_stats_static,
+                "duty_cycle": {
+                    "max_airtime_percent": self._max_duty_cycle_percent,
+                    "enforcement_enabled": enforcement,
+                },
+                "delays": self._delays_stats_static,
+            }
+            self._stats_config_cache = cached
+            self._stats_counters["config_rebuilds"] += 1
+        return cached
 
     def get_stats(self) -> dict:
 
-        uptime_seconds = time.time() - self.start_time
-
-        # Get config sections
-        repeater_config = self.config.get("repeater", {})
-        duty_cycle_config = self.config.get("duty_cycle", {})
-        delays_config = self.config.get("delays", {})
+        build_start_ns = time.perf_counter_ns()
+        uptime_seconds = time.monotonic() - self.start_time
 
-        max_airtime_ms = duty_cycle_config.get("max_airtime_per_minute", 3600)
-        max_duty_cycle_percent = (max_airtime_ms / 60000) * 100  # 60000ms = 1 minute
-
-        # Calculate actual hourly rates (packets in last 3600 seconds)
-        now = time.time()
-        packets_last_hour = [p for p in self.recent_packets if now - p["timestamp"] < 3600]
-        rx_per_hour = len(packets_last_hour)
-        forwarded_per_hour = sum(1 for p in packets_last_hour if p.get("transmitted", False))
+        # Hourly rates come from the rolling timestamp windows. This runs on
+        # a cherrypy worker thread while the RX path appends/prunes on the
+        # asyncio thread, so only read here: snapshot atomically and count
+        # the still-fresh entries. Pruning stays on the RX path.
+        cutoff = time.time() - 3600
+        rx_per_hour = sum(1 for ts in tuple(self._rx_times) if ts > cutoff)
+        forwarded_per_hour = sum(1 for ts in tuple(self._fwd_times) if ts > cutoff)
 
         # Get current noise floor from radio
         noise_floor_dbm = self.get_noise_floor()
@@ -619,40 +959,20 @@ class RepeaterHandler(BaseHandler):
             "dropped_count": self.dropped_count,
             "rx_per_hour": rx_per_hour,
             "forwarded_per_hour": forwarded_per_hour,
-            "recent_packets": self.recent_packets,
+            "recent_packets": list(self.recent_packets),
             "neighbors": self.neighbors,
             "uptime_seconds": uptime_seconds,
             "noise_floor_dbm": noise_floor_dbm,
+            "noise_floor_cache_hits": self._noise_floor_hits,
+            "noise_floor_cache_misses": self._noise_floor_misses,
             # Add configuration data
-            "config": {
-                "node_name": repeater_config.get("node_name", "Unknown"),
-                "repeater": {
-                    "mode": repeater_config.get("mode", "forward"),
-                    "use_score_for_tx": self.use_score_for_tx,
-                    "score_threshold": self.score_threshold,
-                    "send_advert_interval_hours": self.send_advert_interval_hours,
-                    "latitude": repeater_config.get("latitude", 0.0),
-                    "longitude": repeater_config.get("longitude", 0.0),
-                },
-                "radio": {
-                    "frequency": self.radio_config.get("frequency", 0),
-                    "tx_power": self.radio_config.get("tx_power", 0),
-                    "bandwidth": self.radio_config.get("bandwidth", 0),
-                    "spreading_factor": self.radio_config.get("spreading_factor", 0),
-                    "coding_rate": self.radio_config.get("coding_rate", 0),
-                    "preamble_length": self.radio_config.get("preamble_length", 0),
-                },
-                "duty_cycle": {
-                    "max_airtime_percent": max_duty_cycle_percent,
-                    "enforcement_enabled": duty_cycle_config.get("enforcement_enabled", True),
-                },
-                "delays": {
-                    "tx_delay_factor": delays_config.get("tx_delay_factor", 1.0),
-                    "direct_tx_delay_factor": delays_config.get("direct_tx_delay_factor", 0.5),
-                },
-            },
+            "config": self._get_stats_config(),
             "public_key": None,
         }
         # Add airtime stats
         stats.update(self.airtime_mgr.get_stats())
+
+        self._stats_counters["calls"] += 1
+        self._stats_counters["build_ns_total"] += time.perf_counter_ns() - build_start_ns
+        stats["diagnostics"] = dict(self._stats_counters)
         return stats
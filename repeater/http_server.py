@@ -43,6 +43,19 @@ class LogBuffer(logging.Handler):
 # Global log buffer instance
 _log_buffer = LogBuffer(max_lines=100)
 
+# Template -> nav page name, used for nav highlighting (built once, not per request)
+_TBODY_RE = re.compile(r'<tbody id="packet-table">.*?</tbody>', re.DOTALL)
+
+_PAGE_MAP = {
+    "dashboard.html": "dashboard",
+    "neighbors.html": "neighbors",
+    "statistics.html": "statistics",
+    "configuration.html": "configuration",
+    "cad-calibration.html": "cad-calibration",
+    "logs.html": "logs",
+    "help.html": "help",
+}
+
 
 class CADCalibrationEngine:
     """Real-time CAD calibration engine"""
@@ -414,6 +427,11 @@ class APIEndpoints:
                 self.config["repeater"] = {}
             self.config["repeater"]["mode"] = new_mode
 
+            # The handler caches the mode flag, so push the change through
+            handler = getattr(self.daemon_instance, "repeater_handler", None)
+            if handler is not None:
+                handler.set_mode(new_mode)
+
             logger.info(f"Mode changed to: {new_mode}")
             return {"success": True, "mode": new_mode}
         except Exception as e:
@@ -663,6 +681,7 @@ class StatsApp:
         self.pub_key = pub_key
         self.dashboard_template = None
         self.config = config or {}
+        self._template_cache = {}
 
         # Create nested API object for routing
         self.api = APIEndpoints(stats_getter, send_advert_func, self.config, event_loop, daemon_instance, config_path)
@@ -677,6 +696,16 @@ class StatsApp:
             except FileNotFoundError:
                 logger.error(f"Template not found: {template_path}")
 
+    def _load_template(self, template_name: str) -> str:
+        """Read a template from disk once and serve it from memory afterwards."""
+        content = self._template_cache.get(template_name)
+        if content is None:
+            template_path = os.path.join(self.template_dir, template_name)
+            with open(template_path, "r") as f:
+                content = f.read()
+            self._template_cache[template_name] = content
+        return content
+
     @cherrypy.expose
     def index(self):
         """Serve dashboard HTML."""
@@ -722,45 +751,27 @@ class StatsApp:
 
         try:
 
-            template_path = os.path.join(self.template_dir, template_name)
-            with open(template_path, "r") as f:
-                template_content = f.read()
+            template_content = self._load_template(template_name)
 
-            nav_path = os.path.join(self.template_dir, "nav.html")
+            # Only hit the cache/disk for nav.html if the page actually embeds it
             nav_content = ""
-            try:
-                with open(nav_path, "r") as f:
-                    nav_content = f.read()
-            except FileNotFoundError:
-                logger.warning(f"Navigation template not found: {nav_path}")
-
-            stats = self.stats_getter() if self.stats_getter else {}
-
-            if "uptime_seconds" not in stats or not isinstance(
-                stats.get("uptime_seconds"), (int, float)
-            ):
-                stats["uptime_seconds"] = 0
-
-            # Calculate uptime in hours
-            uptime_seconds = stats.get("uptime_seconds", 0)
-            uptime_hours = int(uptime_seconds // 3600) if uptime_seconds else 0
+            if "<!-- NAVIGATION_PLACEHOLDER -->" in template_content:
+                try:
+                    nav_content = self._load_template("nav.html")
+                except FileNotFoundError:
+                    logger.warning(
+                        f"Navigation template not found: "
+                        f"{os.path.join(self.template_dir, 'nav.html')}"
+                    )
 
             # Determine current page for nav highlighting
-            page_map = {
-                "dashboard.html": "dashboard",
-                "neighbors.html": "neighbors",
-                "statistics.html": "statistics",
-                "configuration.html": "configuration",
-                "cad-calibration.html": "cad-calibration",
-                "logs.html": "logs",
-                "help.html": "help",
-            }
-            current_page = page_map.get(template_name, "")
+            current_page = _PAGE_MAP.get(template_name, "")
 
-            # Prepare basic substitutions
+            # Prepare basic substitutions (format the timestamp once per render)
+            last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             html = template_content
             html = html.replace("{{ node_name }}", str(self.node_name))
-            html = html.replace("{{ last_updated }}", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            html = html.replace("{{ last_updated }}", last_updated)
             html = html.replace("{{ page }}", current_page)
 
             # Replace navigation placeholder with actual nav content
@@ -770,9 +781,7 @@ class StatsApp:
                     "{{ node_name }}", str(self.node_name)
                 )
                 nav_substitutions = nav_substitutions.replace("{{ pub_key }}", str(self.pub_key))
-                nav_substitutions = nav_substitutions.replace(
-                    "{{ last_updated }}", datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                )
+                nav_substitutions = nav_substitutions.replace("{{ last_updated }}", last_updated)
 
                 # Handle active state for nav items
                 nav_substitutions = nav_substitutions.replace(
@@ -802,12 +811,20 @@ class StatsApp:
 
                 html = html.replace("<!-- NAVIGATION_PLACEHOLDER -->", nav_substitutions)
 
-            # Build packets table HTML for dashboard
+            # Build packets table HTML for dashboard - only the dashboard needs the
+            # full stats snapshot, so don't pay for it on the other pages
             if template_name == "dashboard.html":
+                stats = self.stats_getter() if self.stats_getter else {}
+
+                uptime_seconds = stats.get("uptime_seconds", 0)
+                if not isinstance(uptime_seconds, (int, float)):
+                    uptime_seconds = 0
+                uptime_hours = int(uptime_seconds // 3600) if uptime_seconds else 0
+
                 recent_packets = stats.get("recent_packets", [])
-                packets_table = ""
 
                 if recent_packets:
+                    rows = []
                     for pkt in recent_packets[-20:]:  # Last 20 packets
                         time_obj = datetime.fromtimestamp(pkt.get("timestamp", 0))
                         time_str = time_obj.strftime("%H:%M:%S")
@@ -824,7 +841,7 @@ class StatsApp:
                         score_val = pkt.get("score", 0)
                         delay_val = pkt.get("tx_delay_ms", 0)
 
-                        packets_table += (
+                        rows.append(
                             "<tr>"
                             f"<td>{time_str}</td>"
                             f'<td><span class="packet-type">{pkt_type}</span></td>'
@@ -837,6 +854,7 @@ class StatsApp:
                             f"<td>{status}</td>"
                             "</tr>"
                         )
+                    packets_table = "".join(rows)
                 else:
                     packets_table = """
                             <tr>
@@ -853,14 +871,8 @@ class StatsApp:
                 html = html.replace("{{ uptime_hours }}", str(uptime_hours))
 
                 # Replace tbody with actual packets
-                tbody_pattern = r'<tbody id="packet-table">.*?</tbody>'
                 tbody_replacement = f'<tbody id="packet-table">\n{packets_table}\n</tbody>'
-                html = re.sub(
-                    tbody_pattern,
-                    tbody_replacement,
-                    html,
-                    flags=re.DOTALL,
-                )
+                html = _TBODY_RE.sub(tbody_replacement, html)
 
             return html
 
@@ -149,6 +149,11 @@ class RepeaterDaemon:
             
             trace_path = parsed_data["trace_path"]
             trace_path_len = len(trace_path)
+
+            # Hash once; the record, the forwarded-flag lookup and the dedup
+            # checks below all reuse this digest
+            pkt_digest = packet.calculate_packet_hash()
+            pkt_hash_short = pkt_digest.hex()[:16]
             
           
             if self.repeater_handler:
@@ -194,7 +199,7 @@ class RepeaterDaemon:
                     "tx_delay_ms": 0,  
                     "transmitted": False,  
                     "is_duplicate": False,  
-                    "packet_hash": packet.calculate_packet_hash().hex()[:16],
+                    "packet_hash": pkt_hash_short,
                     "drop_reason": "trace_received",
                     "path_hash": path_hash,
                     "src_hash": None,  
@@ -224,22 +229,24 @@ class RepeaterDaemon:
             parsed_data["rssi"] = getattr(packet, "rssi", 0)
             formatted_response = self.trace_handler._format_trace_response(parsed_data)
             
-            logger.info(f"[TraceHandler] {formatted_response}")
-            logger.info(f"[TraceHandler] Path SNRs: [{', '.join(path_snrs)}], Hashes: [{', '.join(path_hashes)}]")
+            logger.info("[TraceHandler] %s", formatted_response)
+            logger.info(
+                "[TraceHandler] Path SNRs: [%s], Hashes: [%s]",
+                ", ".join(path_snrs),
+                ", ".join(path_hashes),
+            )
             
      
             if (packet.path_len < trace_path_len and 
                 len(trace_path) > packet.path_len and
                 trace_path[packet.path_len] == self.local_hash and
-                self.repeater_handler and not self.repeater_handler.is_duplicate(packet)):
-                
-                if self.repeater_handler and hasattr(self.repeater_handler, 'recent_packets'):
-                    packet_hash = packet.calculate_packet_hash().hex()[:16]
-                    for record in reversed(self.repeater_handler.recent_packets):
-                        if record.get("packet_hash") == packet_hash:
-                            record["transmitted"] = True
-                            record["drop_reason"] = "trace_forwarded"
-                            break
+                self.repeater_handler and not self.repeater_handler.is_duplicate(packet, pkt_digest)):
+
+                if self.repeater_handler and hasattr(self.repeater_handler, '_recent_by_hash'):
+                    record = self.repeater_handler._recent_by_hash.get(pkt_hash_short)
+                    if record is not None:
+                        record["transmitted"] = True
+                        record["drop_reason"] = "trace_forwarded"
    
                 current_snr = packet.get_snr()
                 
@@ -259,23 +266,27 @@ class RepeaterDaemon:
                 packet.path[packet.path_len] = snr_byte
                 packet.path_len += 1
                 
-                logger.info(f"[TraceHandler] Forwarding trace, stored SNR {current_snr:.1f}dB at position {packet.path_len-1}")
+                logger.info(
+                    "[TraceHandler] Forwarding trace, stored SNR %.1fdB at position %d",
+                    current_snr,
+                    packet.path_len - 1,
+                )
                 
                 # Mark as seen and forward directly (bypass normal routing, no ACK required)
-                self.repeater_handler.mark_seen(packet)
+                self.repeater_handler.mark_seen(packet, digest=pkt_digest)
                 if self.dispatcher:
                     await self.dispatcher.send_packet(packet, wait_for_ack=False)
             else:
                 # Show why we didn't forward
                 if packet.path_len >= trace_path_len:
-                    logger.info(f"[TraceHandler] Trace completed (reached end of path)")
+                    logger.info("[TraceHandler] Trace completed (reached end of path)")
                 elif len(trace_path) <= packet.path_len:
-                    logger.info(f"[TraceHandler] Path index out of bounds")
+                    logger.info("[TraceHandler] Path index out of bounds")
                 elif trace_path[packet.path_len] != self.local_hash:
                     expected_hash = trace_path[packet.path_len] if packet.path_len < len(trace_path) else None
-                    logger.info(f"[TraceHandler] Not our turn (next hop: 0x{expected_hash:02x})")
-                elif self.repeater_handler and self.repeater_handler.is_duplicate(packet):
-                    logger.info(f"[TraceHandler] Duplicate packet, ignoring")
+                    logger.info("[TraceHandler] Not our turn (next hop: 0x%02x)", expected_hash)
+                elif self.repeater_handler and self.repeater_handler.is_duplicate(packet, pkt_digest):
+                    logger.info("[TraceHandler] Duplicate packet, ignoring")
 
         except Exception as e:
             logger.error(f"[TraceHandler] Error processing trace packet: {e}")
@@ -346,6 +357,10 @@ class RepeaterDaemon:
 
         await self.initialize()
 
+        # Kick off the handler's background tasks (periodic adverts)
+        if self.repeater_handler:
+            self.repeater_handler.start_background_tasks()
+
         # Start HTTP stats server
         http_port = self.config.get("http", {}).get("port", 8000)
         http_host = self.config.get("http", {}).get("host", "0.0.0.0")
@@ -389,6 +404,8 @@ class RepeaterDaemon:
             await self.dispatcher.run_forever()
         except KeyboardInterrupt:
             logger.info("Shutting down...")
+            if self.repeater_handler:
+                await self.repeater_handler.stop_background_tasks()
             if self.http_server:
                 self.http_server.stop()
 